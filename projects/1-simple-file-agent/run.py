@@ -1,15 +1,54 @@
 import os
 from src.core.agent import Agent
+from src.core.orchestrator import AgentOrchestrator
+from src.models.model_route import ModelRoute
+from src.models.model_tier import ModelTier
+from src.services.model_router import ModelRouter
 from src.services.tool_service import AgentToolService
 from src.services.console_logger_service import ConsoleLoggerService
+from src.services.workspace_watcher import WorkspaceWatcher
 
 model: str | None = os.getenv('OPEN_AI_MODEL_NAME')
 
 if model is None:
     raise ValueError('No model provided in the environment')
 
+fast_model: str | None = os.getenv('OPEN_AI_FAST_MODEL_NAME')
+# Request timeout, and median latency above which a model is only tried after the healthy ones
+model_max_latency: float | None = float(os.getenv('OPEN_AI_MODEL_MAX_LATENCY') or 0) or None
+fast_model_max_latency: float | None = float(os.getenv('OPEN_AI_FAST_MODEL_MAX_LATENCY') or 20) or None
+max_subagents: int = int(os.getenv('MAX_SUBAGENTS') or 4)
+max_iterations: int = int(os.getenv('MAX_ITERATIONS') or 20)
+max_task_seconds: float | None = float(os.getenv('MAX_TASK_SECONDS') or 0) or None
+
+watch_workspace: bool = (os.getenv('WATCH_WORKSPACE') or 'true').lower() not in ('false', '0', 'no')
+
 logger = ConsoleLoggerService()
-agent: Agent = Agent(tool_service=AgentToolService(logger=logger), model=model, logger=logger)
+
+# Keeps file metadata of the working directory in memory so tools don't hit the disk for it
+workspace_watcher: WorkspaceWatcher | None = None
+if watch_workspace:
+    workspace_watcher = WorkspaceWatcher(logger=logger)
+    workspace_watcher.start()
+
+# Cheap navigation steps go to the fast model when one is configured, the main model handles the rest
+routes: list[ModelRoute] = [ModelRoute(model, tier=ModelTier.STRONG, max_latency=model_max_latency)]
+if fast_model:
+    routes.append(ModelRoute(fast_model, tier=ModelTier.FAST, max_latency=fast_model_max_latency))
+model_router = ModelRouter(routes, logger=logger)
+
+tool_service = AgentOrchestrator(
+    tool_service=AgentToolService(logger=logger, workspace_watcher=workspace_watcher),
+    model=model,
+    max_concurrency=max_subagents,
+    max_iterations=max_iterations,
+    max_duration=max_task_seconds,
+    logger=logger,
+    model_router=model_router,
+    workspace_watcher=workspace_watcher
+)
+agent: Agent = Agent(tool_service=tool_service, model=model, max_iterations=max_iterations, logger=logger,
+                     model_router=model_router, max_duration=max_task_seconds, workspace_watcher=workspace_watcher)
 
 print("🤖 AI File Agent - Ready to help with your files and folders!")
 print("   Type 'quit' or 'exit' to end the session\n")
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from openai.types.chat import ChatCompletion
+
+
+class LlmBackendInterface(ABC):
+    """
+    Abstract interface for the chat completion provider.
+    Allows swapping the OpenAI API for other providers or stubs.
+    """
+
+    @abstractmethod
+    def complete(self, model: str, messages: List[Dict], tools: List[Dict],
+                 timeout: float | None = None) -> ChatCompletion:
+        """
+        Request the next completion from the given model.
+
+        Args:
+            model: Name of the model to use
+            messages: Conversation so far
+            tools: Tools definition available to the model
+            timeout: Seconds after which the request is abandoned, None for the provider default
+
+        Returns:
+            The chat completion
+        """
+        pass
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 
+from src.models.run_metrics import RunMetrics
+
 
 class LoggerInterface(ABC):
     """
@@ -37,3 +39,13 @@ class LoggerInterface(ABC):
     def log_user_prompt(self, message: str) -> None:
         """Log user interaction prompts."""
         pass
+
+    @abstractmethod
+    def log_model_stats(self, model: str, stats: Dict[str, Any]) -> None:
+        """Log rolling latency/error statistics of a model."""
+        pass
+
+    @abstractmethod
+    def log_run_metrics(self, metrics: RunMetrics) -> None:
+        """Log how a task run went: iterations, executed/memoized tool calls and why it stopped."""
+        pass
@@ -13,3 +13,17 @@ class ToolServiceInterface(ABC):
     @abstractmethod
     def get_tools_definition(self) -> List[Dict]:
         pass
+
+    def is_read_only(self, tool_name: str) -> bool:
+        """
+        Whether the tool only reads state, so an identical call returns the same result
+        as long as no other tool ran in between. Defaults to False.
+        """
+        return False
+
+    def set_deadline(self, deadline: float | None) -> None:
+        """
+        time.monotonic() value by which the current task has to be done, None if it has no time budget.
+        Lets tools doing long work (e.g. sub-agents) stay within the caller's budget. Ignored by default.
+        """
+        pass
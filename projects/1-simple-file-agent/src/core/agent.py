@@ -1,10 +1,17 @@
+import time
+from typing import Any
+
 from dotenv import load_dotenv
 
+from src.core.loop_guard import LoopGuard
+from src.models.run_metrics import RunMetrics, StopReason
 from src.models.tool_call_response import ToolCallResult
 from src.services.llm_service import LlmService
 from src.contracts.tool_service_interface import ToolServiceInterface
 from src.contracts.logger_interface import LoggerInterface
 from src.services.console_logger_service import ConsoleLoggerService
+from src.services.model_router import ModelRouter
+from src.services.workspace_watcher import WorkspaceWatcher
 from src.models.tool_call_request import ToolCallRequest
 
 load_dotenv()
@@ -12,54 +19,136 @@ load_dotenv()
 
 class Agent:
 
+    __LOOP_NOTICE: str = (
+        "[Notice] You keep repeating the same calls without making progress. Stop now and call "
+        "submit_final_response with what you have so far, explaining what could not be completed."
+    )
+
     def __init__(self, tool_service: ToolServiceInterface, model: str, max_iterations: int = 20,
-                 logger: LoggerInterface | None = None):
+                 logger: LoggerInterface | None = None, system_prompt: str | None = None,
+                 persist_history: bool = True, model_router: ModelRouter | None = None,
+                 max_duration: float | None = None, max_repeats: int = 3,
+                 workspace_watcher: WorkspaceWatcher | None = None, report_model_stats: bool = True):
         self.__tool_service: ToolServiceInterface = tool_service
         self.__MAX_ITERATIONS: int = max_iterations
+        self.__MAX_DURATION: float | None = max_duration
+        self.__MAX_REPEATS: int = max_repeats
+        self.__workspace_watcher: WorkspaceWatcher | None = workspace_watcher
+        # The router may be shared with sub-agents: only the top-level agent reports its stats
+        self.__report_model_stats: bool = report_model_stats
+        self.last_run_metrics: RunMetrics | None = None
         self.__logger = logger or ConsoleLoggerService()
 
         self.__llm_service: LlmService = LlmService(
             model=model,
             tools_definition=self.__tool_service.get_tools_definition(),
-            logger=self.__logger
+            logger=self.__logger,
+            system_prompt=system_prompt,
+            persist_history=persist_history,
+            model_router=model_router
         )
 
-    def run(self, task: str):
-        iteration_count: int = 0
+    def run(self, task: str, max_iterations: int | None = None, max_duration: float | None = None) -> Any:
+        """
+        Process the task and return the final response, or None if it was stopped early
+        (iteration or time budget exhausted, runaway loop). See last_run_metrics for the reason.
+        """
+        iteration_budget: int = max_iterations or self.__MAX_ITERATIONS
+        time_budget: float | None = max_duration or self.__MAX_DURATION
+        loop_guard: LoopGuard = LoopGuard(self.__tool_service, max_repeats=self.__MAX_REPEATS,
+                                          workspace_watcher=self.__workspace_watcher)
+        metrics: RunMetrics = RunMetrics()
+        self.last_run_metrics = metrics
+        started_at: float = time.monotonic()
+        final_response: Any = None
+        wrapping_up: bool = False
 
         self.__logger.log_progress("Starting task processing...")
 
         # We add the user request to the messages stack
         self.__llm_service.push_user_message(message=task)
 
-        while True and iteration_count < self.__MAX_ITERATIONS:
-            iteration_count += 1
+        # Memoized results about files changed on disk must not be served again
+        if self.__workspace_watcher is not None:
+            self.__workspace_watcher.subscribe(loop_guard.invalidate)
 
-            tool_call_request: ToolCallRequest = self.__llm_service.get_next_tool_call()
+        # Sub-agents started by the tools must not outlive the task's own budget
+        self.__tool_service.set_deadline(started_at + time_budget if time_budget is not None else None)
 
-            # We call the tool and catch any exceptions to feed back to the LLM
-            try:
-                tool_call_result: ToolCallResult = self.__tool_service.invoke(
-                    tool_call=tool_call_request,
-                )
-            except Exception as e:
-                error_message = f"Tool execution failed: {str(e)}"
-                self.__logger.log_error(error_message)
-
-                # Create error result to feed back to LLM
-                tool_call_result = ToolCallResult(
-                    content=error_message,
-                    exit_loop=False
-                )
+        try:
+            while metrics.stop_reason is None:
+                if not wrapping_up and metrics.iterations >= iteration_budget:
+                    metrics.stop_reason = StopReason.ITERATION_LIMIT
+                    break
 
-            self.__logger.log_tool_result(tool_call_result.content)
+                if (not wrapping_up and time_budget is not None
+                        and time.monotonic() - started_at >= time_budget):
+                    metrics.stop_reason = StopReason.TIME_LIMIT
+                    break
 
-            # We push the tool call response
-            self.__llm_service.push_tool_response(
-                tool_id=tool_call_request.tool_call_id,
-                tool_call_result=tool_call_result.content
-            )
+                metrics.iterations += 1
+
+                tool_call_request: ToolCallRequest = self.__llm_service.get_next_tool_call()
+
+                # Identical read-only calls are answered from memory instead of running the tool again
+                memoized_result: ToolCallResult | None = loop_guard.recall(tool_call_request)
 
-            # If this is the final function call, we exit the loop
-            if tool_call_result.exit_loop:
-                break
+                if memoized_result is not None:
+                    tool_call_result: ToolCallResult = memoized_result
+                    metrics.memoized_tool_calls += 1
+                else:
+                    tool_call_result = self.__invoke_tool(tool_call_request)
+                    metrics.executed_tool_calls += 1
+                    loop_guard.record(tool_call_request, tool_call_result)
+
+                # The final response has already been shown to the user
+                if not tool_call_result.exit_loop:
+                    self.__logger.log_tool_result(tool_call_result.content)
+
+                # We push the tool call response
+                self.__llm_service.push_tool_response(
+                    tool_id=tool_call_request.tool_call_id,
+                    tool_call_result=tool_call_result.content
+                )
+
+                # If this is the final function call, we exit the loop
+                if tool_call_result.exit_loop:
+                    metrics.stop_reason = StopReason.COMPLETED
+                    final_response = tool_call_result.content
+                elif wrapping_up:
+                    metrics.stop_reason = StopReason.LOOP_DETECTED
+                elif loop_guard.is_runaway:
+                    # Give the model one last turn to hand over a final response
+                    wrapping_up = True
+                    self.__logger.log_error("Loop detected, asking the agent to wrap up")
+                    self.__llm_service.push_user_message(message=self.__LOOP_NOTICE)
+        finally:
+            self.__tool_service.set_deadline(None)
+            if self.__workspace_watcher is not None:
+                self.__workspace_watcher.unsubscribe(loop_guard.invalidate)
+
+        metrics.duration = time.monotonic() - started_at
+
+        if metrics.stop_reason is not StopReason.COMPLETED:
+            self.__logger.log_error(f"Task stopped before completion: {metrics.stop_reason.value}")
+
+        self.__logger.log_run_metrics(metrics)
+        if self.__report_model_stats:
+            self.__llm_service.log_model_stats()
+        return final_response
+
+    def __invoke_tool(self, tool_call_request: ToolCallRequest) -> ToolCallResult:
+        # We call the tool and catch any exceptions to feed back to the LLM
+        try:
+            return self.__tool_service.invoke(
+                tool_call=tool_call_request,
+            )
+        except Exception as e:
+            error_message = f"Tool execution failed: {str(e)}"
+            self.__logger.log_error(error_message)
+
+            # Create error result to feed back to LLM
+            return ToolCallResult(
+                content=error_message,
+                exit_loop=False
+            )
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, FrozenSet, Tuple
+
+from src.contracts.tool_service_interface import ToolServiceInterface
+from src.models.tool_call_request import ToolCallRequest
+from src.models.tool_call_response import ToolCallResult
+from src.services.workspace_watcher import WorkspaceWatcher
+
+
+class LoopGuard:
+    """
+    Watches the tool calls made for a single task.
+    Identical calls to read-only tools are answered from memory until a state-changing tool runs,
+    as long as a running WorkspaceWatcher covers the paths they read (files may change outside the agent),
+    and every (tool, arguments, result hash) fingerprint of read-only calls is counted so that a model
+    going round in circles - repeating a call or alternating between a few states - can be stopped.
+    invalidate() can be subscribed to a WorkspaceWatcher to forget results about files changed on disk.
+    """
+
+    __REPEAT_NOTE: str = (
+        "[Repeated call: nothing changed since you made this exact call, here is the same result again. "
+        "Do not repeat calls, use the result or try something else.]"
+    )
+
+    def __init__(self, tool_service: ToolServiceInterface, max_repeats: int = 3,
+                 workspace_watcher: WorkspaceWatcher | None = None) -> None:
+        self.__tool_service = tool_service
+        self.__max_repeats = max_repeats
+        self.__workspace_watcher = workspace_watcher
+        self.__lock = threading.Lock()
+        # Call key -> (result, absolute paths found in the call arguments)
+        self.__memoized_results: Dict[str, Tuple[ToolCallResult, FrozenSet[str]]] = {}
+        self.__fingerprint_counts: Dict[str, int] = {}
+        self.__highest_count: int = 0
+
+    @property
+    def is_runaway(self) -> bool:
+        """True once any read-only fingerprint has been seen max_repeats times."""
+        return self.__highest_count >= self.__max_repeats
+
+    def recall(self, tool_call: ToolCallRequest) -> ToolCallResult | None:
+        """Return the memoized result of an identical earlier call, or None if the tool has to run."""
+        call_key = self.__get_call_key(tool_call)
+        with self.__lock:
+            memoized = self.__memoized_results.get(call_key)
+        if memoized is None:
+            return None
+
+        result, argument_paths = memoized
+        if not self.__is_watched(argument_paths):
+            # The watcher stopped: changes made outside the agent would go unnoticed
+            with self.__lock:
+                self.__memoized_results.pop(call_key, None)
+            return None
+
+        self.__count(call_key, result)
+        return ToolCallResult(content=f"{self.__REPEAT_NOTE}\n{result.content}", exit_loop=result.exit_loop)
+
+    def record(self, tool_call: ToolCallRequest, result: ToolCallResult) -> None:
+        """Register the result of a tool that actually ran."""
+        call_key = self.__get_call_key(tool_call)
+
+        if not self.__tool_service.is_read_only(tool_call.tool_name):
+            # Anything read so far may be stale now. Repeating such a call (answering the user,
+            # appending the same line) can be legitimate, so it doesn't count towards a loop
+            with self.__lock:
+                self.__memoized_results.clear()
+            return
+
+        argument_paths = self.__get_argument_paths(tool_call)
+        if self.__is_watched(argument_paths):
+            with self.__lock:
+                self.__memoized_results[call_key] = (result, argument_paths)
+        self.__count(call_key, result)
+
+    def invalidate(self, path: str) -> None:
+        """Forget the results of calls about this path, its parent directory or anything below it."""
+        path = os.path.abspath(path)
+        affected = {path, os.path.dirname(path)}
+        prefix = path.rstrip(os.sep) + os.sep
+
+        with self.__lock:
+            for call_key, (_, argument_paths) in list(self.__memoized_results.items()):
+                if any(p in affected or p.startswith(prefix) for p in argument_paths):
+                    del self.__memoized_results[call_key]
+
+    def __count(self, call_key: str, result: ToolCallResult) -> None:
+        result_hash = hashlib.sha256(str(result.content).encode('utf-8')).hexdigest()
+        fingerprint = f"{call_key}:{result_hash}"
+
+        count = self.__fingerprint_counts.get(fingerprint, 0) + 1
+        self.__fingerprint_counts[fingerprint] = count
+        self.__highest_count = max(self.__highest_count, count)
+
+    def __is_watched(self, argument_paths: FrozenSet[str]) -> bool:
+        # Calls without paths (load_memories) only read state the agent changes through its own tools
+        if not argument_paths:
+            return True
+
+        return self.__workspace_watcher is not None and all(
+            self.__workspace_watcher.covers(path) for path in argument_paths
+        )
+
+    @staticmethod
+    def __get_argument_paths(tool_call: ToolCallRequest) -> FrozenSet[str]:
+        return frozenset(
+            os.path.abspath(value) for name, value in tool_call.tool_arguments.items()
+            if name == "path" and isinstance(value, str)
+        )
+
+    @staticmethod
+    def __get_call_key(tool_call: ToolCallRequest) -> str:
+        arguments = json.dumps(tool_call.tool_arguments, sort_keys=True, default=str)
+        return f"{tool_call.tool_name}({arguments})"
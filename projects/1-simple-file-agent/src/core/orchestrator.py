@@ -0,0 +1,166 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from src.contracts.logger_interface import LoggerInterface
+from src.contracts.tool_service_interface import ToolServiceInterface
+from src.core.agent import Agent
+from src.models.tool_call_request import ToolCallRequest
+from src.models.run_metrics import StopReason
+from src.models.tool_call_response import ToolCallResult
+from src.services.console_logger_service import ConsoleLoggerService
+from src.services.model_router import ModelRouter
+from src.services.subtask_communication_service import SubtaskCommunicationService
+from src.services.subtask_logger_service import SubtaskLoggerService
+from src.services.tool_service import AgentToolService
+from src.services.workspace_watcher import WorkspaceWatcher
+from src.utils.file_utils import read_file
+
+
+class AgentOrchestrator(ToolServiceInterface):
+    """
+    Tool service wrapper giving the agent a `delegate_subtasks` tool.
+    Each subtask is handled by a child Agent with its own isolated message history,
+    children run concurrently (up to max_concurrency) and only their final responses
+    are returned to the parent. Every other tool call goes to the wrapped tool service.
+    """
+
+    __DELEGATE_TOOL_NAME: str = "delegate_subtasks"
+    # Concurrent children would overwrite each other's preferences: memories stay with the parent
+    __CHILD_EXCLUDED_TOOLS: frozenset = frozenset({"update_memories", "load_memories"})
+
+    def __init__(self, tool_service: ToolServiceInterface, model: str, max_concurrency: int = 4,
+                 max_iterations: int = 20, logger: LoggerInterface | None = None,
+                 child_tool_service_factory: Callable[[LoggerInterface], ToolServiceInterface] | None = None,
+                 model_router: ModelRouter | None = None,
+                 workspace_watcher: WorkspaceWatcher | None = None,
+                 max_duration: float | None = None) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.__tool_service = tool_service
+        self.__model = model
+        self.__model_router = model_router
+        self.__workspace_watcher = workspace_watcher
+        self.__max_concurrency = max_concurrency
+        self.__max_iterations = max_iterations
+        # Wall-time budget of each subtask, the parent only checks its own between iterations
+        self.__max_duration = max_duration
+        # Set by the parent agent for the task being run, subtasks never get more time than it has left
+        self.__deadline: float | None = None
+        self.__logger = logger or ConsoleLoggerService()
+        self.__child_tool_service_factory = child_tool_service_factory or self.__create_child_tool_service
+
+        self.__child_system_prompt: str = read_file("system-prompt.md") + "\n\n" + read_file("subtask-system-prompt.md")
+
+    def invoke(self, tool_call: ToolCallRequest) -> Any:
+        if tool_call.tool_name != self.__DELEGATE_TOOL_NAME:
+            return self.__tool_service.invoke(tool_call)
+
+        try:
+            return self.__delegate_subtasks(**tool_call.tool_arguments)
+        except TypeError as error:
+            self.__logger.log_error(f"Tool call failed {tool_call.tool_name}: {error}")
+            raise Exception("Invalid tool arguments")
+
+    def is_read_only(self, tool_name: str) -> bool:
+        # Sub-agents may write files, so delegate_subtasks never is
+        return tool_name != self.__DELEGATE_TOOL_NAME and self.__tool_service.is_read_only(tool_name)
+
+    def set_deadline(self, deadline: float | None) -> None:
+        self.__deadline = deadline
+        self.__tool_service.set_deadline(deadline)
+
+    def run_subtasks(self, tasks: List[str]) -> List[Dict[str, Any]]:
+        """Run every task on its own child agent and return their final responses, in task order."""
+        if not tasks:
+            return []
+
+        self.__logger.log_progress(
+            f"Delegating {len(tasks)} subtask(s) to up to {self.__max_concurrency} sub-agents..."
+        )
+
+        with ThreadPoolExecutor(max_workers=min(self.__max_concurrency, len(tasks)),
+                                thread_name_prefix="sub-agent") as executor:
+            responses = list(executor.map(self.__run_subtask, range(len(tasks)), tasks))
+
+        return [{"task": task, "response": response} for task, response in zip(tasks, responses)]
+
+    def get_tools_definition(self) -> List[Dict]:
+        return self.__tool_service.get_tools_definition() + [
+            {
+                "type": "function",
+                "function": {
+                    "name": self.__DELEGATE_TOOL_NAME,
+                    "description": "Splits a large job into independent subtasks handled concurrently by sub-agents. "
+                                   "Each sub-agent starts from scratch with the same file tools, cannot ask the user "
+                                   "anything and only returns its final response.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "tasks": {
+                                "type": "array",
+                                "items": {
+                                    "type": "string"
+                                },
+                                "description": "Self-contained subtask descriptions, one per sub-agent. Include "
+                                               "every path and detail the sub-agent needs."
+                            }
+                        },
+                        "required": ["tasks"],
+                        "additionalProperties": False
+                    },
+                    "strict": True
+                }
+            }
+        ]
+
+    def __delegate_subtasks(self, tasks: List[str]) -> ToolCallResult:
+        if not tasks:
+            return ToolCallResult(content="Error: No subtasks provided")
+
+        return ToolCallResult(content=self.run_subtasks(tasks))
+
+    def __run_subtask(self, index: int, task: str) -> str:
+        max_duration: float | None = self.__max_duration
+        if self.__deadline is not None:
+            remaining: float = self.__deadline - time.monotonic()
+            # Subtasks still queued when the parent's time runs out are not started
+            if remaining <= 0:
+                return f"Error: Subtask stopped before completion ({StopReason.TIME_LIMIT.value})"
+            max_duration = remaining if max_duration is None else min(max_duration, remaining)
+
+        # Children log concurrently: tag their output so it stays readable
+        logger: LoggerInterface = SubtaskLoggerService(self.__logger, f"sub-agent {index + 1}")
+
+        try:
+            child: Agent = Agent(
+                tool_service=self.__child_tool_service_factory(logger),
+                model=self.__model,
+                max_iterations=self.__max_iterations,
+                max_duration=max_duration,
+                logger=logger,
+                system_prompt=self.__child_system_prompt,
+                persist_history=False,
+                model_router=self.__model_router,
+                workspace_watcher=self.__workspace_watcher,
+                report_model_stats=False
+            )
+            response = child.run(task)
+        except Exception as e:
+            logger.log_error(f"Sub-agent failed: {e}")
+            return f"Error: Subtask failed: {str(e)}"
+
+        if response is None:
+            stop_reason: StopReason | None = child.last_run_metrics.stop_reason if child.last_run_metrics else None
+            return f"Error: Subtask stopped before completion ({stop_reason.value if stop_reason else 'unknown'})"
+
+        return str(response)
+
+    def __create_child_tool_service(self, logger: LoggerInterface) -> ToolServiceInterface:
+        return AgentToolService(
+            communication_service=SubtaskCommunicationService(logger),
+            logger=logger,
+            workspace_watcher=self.__workspace_watcher,
+            excluded_tools=set(self.__CHILD_EXCLUDED_TOOLS)
+        )
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class DurabilityLevel(Enum):
+    """
+    How far a write must travel before it is considered committed.
+    NONE leaves data to the OS, FLUSH hands it to the OS before returning,
+    FSYNC forces it onto the storage device.
+    Direct writes always hand data to the OS when closing the file, so NONE and FLUSH
+    only differ for the GroupCommitWriter, where NONE doesn't wait for the commit.
+    """
+
+    NONE = "none"
+    FLUSH = "flush"
+    FSYNC = "fsync"
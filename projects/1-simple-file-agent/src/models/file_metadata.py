@@ -0,0 +1,9 @@
+class FileMetadata:
+    def __init__(self, size: int, mtime: float, is_dir: bool):
+        self.size = size
+        self.mtime = mtime
+        self.is_dir = is_dir
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, FileMetadata) and self.size == other.size
+                and self.mtime == other.mtime and self.is_dir == other.is_dir)
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class IterationType(Enum):
+    """Kind of step the agent loop is about to take."""
+
+    NAVIGATION = "navigation"  # A navigation tool (e.g. list_files) succeeded, pick where to go next
+    REASONING = "reasoning"  # Anything else: analyse a request, write content, answer or recover from an error
@@ -0,0 +1,10 @@
+from src.models.model_tier import ModelTier
+
+
+class ModelRoute:
+    def __init__(self, model: str, tier: ModelTier = ModelTier.STRONG, max_context_tokens: int | None = None,
+                 max_latency: float | None = None):
+        self.model = model
+        self.tier = tier
+        self.max_context_tokens = max_context_tokens
+        self.max_latency = max_latency
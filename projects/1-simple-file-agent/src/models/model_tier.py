@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ModelTier(Enum):
+    """Cost/capability class of a model, used to route cheap steps to fast models."""
+
+    FAST = "fast"
+    STRONG = "strong"
@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class StopReason(Enum):
+    """Why the agent loop ended."""
+
+    COMPLETED = "completed"
+    ITERATION_LIMIT = "iteration_limit"
+    TIME_LIMIT = "time_limit"
+    LOOP_DETECTED = "loop_detected"
+
+
+class RunMetrics:
+    def __init__(self):
+        self.iterations: int = 0
+        self.executed_tool_calls: int = 0
+        self.memoized_tool_calls: int = 0
+        self.duration: float = 0.0
+        self.stop_reason: StopReason | None = None
@@ -1,4 +1,5 @@
 from src.contracts.logger_interface import LoggerInterface
+from src.models.run_metrics import RunMetrics
 from typing import Dict, Any
 import json
 
@@ -45,3 +46,14 @@ class ConsoleLoggerService(LoggerInterface):
 
     def log_user_prompt(self, message: str) -> None:
         print(f"\n❓ {message}")
+
+    def log_model_stats(self, model: str, stats: Dict[str, Any]) -> None:
+        p50 = f"{stats['p50_latency']:.2f}s" if stats.get('p50_latency') is not None else "n/a"
+        p95 = f"{stats['p95_latency']:.2f}s" if stats.get('p95_latency') is not None else "n/a"
+        print(f"📊 {model}: {stats['calls']} calls, p50 {p50}, p95 {p95}, "
+              f"errors {stats['errors']} ({stats['error_rate']:.0%})")
+
+    def log_run_metrics(self, metrics: RunMetrics) -> None:
+        stop_reason = metrics.stop_reason.value if metrics.stop_reason else "unknown"
+        print(f"📈 Run: {metrics.iterations} iterations, {metrics.executed_tool_calls} tool calls, "
+              f"{metrics.memoized_tool_calls} repeats skipped, {metrics.duration:.1f}s ({stop_reason})")
@@ -1,16 +1,32 @@
+import errno
 import os
-from typing import List, Union
+import secrets
+from typing import List, Set
+
+from src.models.durability_level import DurabilityLevel
+from src.services.workspace_watcher import WorkspaceWatcher
 
 
 class FileOperationsService:
     """
     Service class dedicated to handling all file system operations.
     Returns standard Python types - agnostic to agent architecture.
+    When given a running WorkspaceWatcher, metadata queries on the paths it covers
+    are answered from its snapshot instead of hitting the file system.
     """
 
-    @staticmethod
-    def list_files(path: str) -> List[str]:
+    # Directories already known to exist, so makedirs isn't checked on every write
+    __known_directories: Set[str] = set()
+
+    def __init__(self, watcher: WorkspaceWatcher | None = None) -> None:
+        self.__watcher = watcher
+
+    def list_files(self, path: str) -> List[str]:
         """List files and directories in the specified path."""
+        entries = self.__watcher.list_directory(path) if self.__watcher is not None else None
+        if entries is not None:
+            return [f"[DIR] {name}" if is_dir else f"     {name}" for name, is_dir in entries]
+
         result = []
         for name in os.listdir(path):
             full_path = os.path.join(path, name)
@@ -26,37 +42,138 @@ class FileOperationsService:
         with open(path, 'r', encoding='utf-8') as f:
             return f.read()
 
-    @staticmethod
-    def write_file(path: str, content: str) -> None:
-        """Write content to file, creating directory if needed."""
-        directory = os.path.dirname(path)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory)
-            
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
+    def write_file(self, path: str, content: str, atomic: bool = False,
+                   durability: DurabilityLevel = DurabilityLevel.NONE) -> None:
+        """
+        Write content to file, creating directory if needed.
+        In atomic mode the content goes to a temporary file that replaces the target
+        only once fully written, so a crash never leaves a truncated file behind.
+        """
+        if atomic:
+            self.__with_directory(path, lambda: self.__write_atomically(path, content, durability))
+        else:
+            self.__with_directory(path, lambda: self.__write(path, content, 'w', durability))
+        self.__refresh_snapshot(path)
 
-    @staticmethod
-    def append_to_file(path: str, content: str) -> None:
+    def append_to_file(self, path: str, content: str,
+                       durability: DurabilityLevel = DurabilityLevel.NONE) -> None:
         """Append content to file, creating directory if needed."""
-        directory = os.path.dirname(path)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory)
-            
-        with open(path, 'a', encoding='utf-8') as f:
-            f.write(content)
+        self.__with_directory(path, lambda: self.__write(path, content, 'a', durability))
+        self.__refresh_snapshot(path)
 
-    @staticmethod
-    def file_exists(path: str) -> bool:
+    def file_exists(self, path: str) -> bool:
         """Check if file exists at path."""
+        if self.__watcher is not None and self.__watcher.covers(path):
+            metadata = self.__watcher.get_metadata(path)
+            return metadata is not None and not metadata.is_dir
+
         return os.path.isfile(path)
 
-    @staticmethod
-    def directory_exists(path: str) -> bool:
+    def directory_exists(self, path: str) -> bool:
         """Check if directory exists at path."""
+        if self.__watcher is not None and self.__watcher.covers(path):
+            metadata = self.__watcher.get_metadata(path)
+            return metadata is not None and metadata.is_dir
+
         return os.path.isdir(path)
 
-    @staticmethod
-    def get_file_size(path: str) -> int:
+    def get_file_size(self, path: str) -> int:
         """Get file size in bytes."""
-        return os.path.getsize(path)
\ No newline at end of file
+        if self.__watcher is not None and self.__watcher.covers(path):
+            metadata = self.__watcher.get_metadata(path)
+            if metadata is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+            return metadata.size
+
+        return os.path.getsize(path)
+
+    def __refresh_snapshot(self, path: str) -> None:
+        # Our own writes must be visible right away, without waiting for the watcher to notice them
+        if self.__watcher is not None:
+            self.__watcher.refresh(path)
+
+    @classmethod
+    def __with_directory(cls, path: str, write) -> None:
+        """Run a write, making sure the parent directory exists (checked once per directory)."""
+        directory = os.path.dirname(path)
+        if not directory:
+            write()
+            return
+
+        if directory not in cls.__known_directories:
+            os.makedirs(directory, exist_ok=True)
+            cls.__known_directories.add(directory)
+
+        try:
+            write()
+        except FileNotFoundError:
+            # The directory was removed behind our back: forget it and try once more
+            cls.__known_directories.discard(directory)
+            os.makedirs(directory, exist_ok=True)
+            cls.__known_directories.add(directory)
+            write()
+
+    @staticmethod
+    def __write(path: str, content: str, mode: str, durability: DurabilityLevel) -> None:
+        # Closing the file hands the data to the OS, so NONE and FLUSH are the same here
+        with open(path, mode, encoding='utf-8') as f:
+            f.write(content)
+            if durability is DurabilityLevel.FSYNC:
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def __write_atomically(path: str, content: str, durability: DurabilityLevel) -> None:
+        # Write through symlinks like open() does: replace the file they point to, not the link
+        path = os.path.realpath(path)
+        try:
+            target_stat: os.stat_result | None = os.stat(path)
+        except FileNotFoundError:
+            target_stat = None
+
+        # A new inode would break hard links and, for files owned by someone else, change the owner
+        if target_stat is not None and (
+                target_stat.st_nlink > 1 or (hasattr(os, 'geteuid') and target_stat.st_uid != os.geteuid())):
+            FileOperationsService.__write(path, content, 'w', durability)
+            return
+
+        directory = os.path.dirname(path) or '.'
+        temp_path = os.path.join(directory, f".{os.path.basename(path)}.{secrets.token_hex(8)}.tmp")
+        # Same mode as a plain open() (0o666 minus the umask), unlike mkstemp's private files
+        file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+
+        try:
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as f:
+                # Replacing an existing file keeps its permissions
+                if target_stat is not None:
+                    os.chmod(temp_path, target_stat.st_mode & 0o7777)
+
+                f.write(content)
+                f.flush()
+                if durability is DurabilityLevel.FSYNC:
+                    os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        if durability is DurabilityLevel.FSYNC:
+            FileOperationsService.__fsync_directory(directory)
+
+    @staticmethod
+    def __fsync_directory(directory: str) -> None:
+        """Persist the rename itself. Not supported on every platform (e.g. Windows)."""
+        try:
+            directory_descriptor = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+
+        try:
+            os.fsync(directory_descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(directory_descriptor)
@@ -0,0 +1,149 @@
+import threading
+from typing import Dict, List
+
+from src.contracts.logger_interface import LoggerInterface
+from src.models.durability_level import DurabilityLevel
+from src.services.console_logger_service import ConsoleLoggerService
+from src.services.file_operations_service import FileOperationsService
+
+
+class _WriteTicket:
+    """Lets a caller wait for its write to be committed and see whether it failed."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.error: Exception | None = None
+
+    def wait(self) -> None:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class _PendingFile:
+    """Writes queued for a single file, merged into one commit."""
+
+    def __init__(self) -> None:
+        self.replacement: str | None = None
+        self.appends: List[str] = []
+        self.tickets: List[_WriteTicket] = []
+
+
+class GroupCommitWriter:
+    """
+    Coalesces many small writes into one commit per file, done on a background thread.
+    Replacements are last-write-wins and committed atomically; appends are concatenated.
+
+    The durability level decides how long callers wait:
+    NONE returns immediately, FLUSH waits until the data reached the OS,
+    FSYNC waits until it has been forced onto the storage device.
+    """
+
+    def __init__(self, durability: DurabilityLevel = DurabilityLevel.NONE, commit_interval: float = 0.05,
+                 logger: LoggerInterface | None = None) -> None:
+        self.__file_service = FileOperationsService()
+        self.__durability = durability
+        self.__commit_interval = commit_interval
+        self.__logger = logger or ConsoleLoggerService()
+
+        self.__lock = threading.Lock()
+        self.__has_pending = threading.Condition(self.__lock)
+        self.__skip_interval = threading.Event()
+        self.__pending: Dict[str, _PendingFile] = {}
+        # Tickets of the batch being committed, so flush() still waits for them
+        self.__in_flight: List[_WriteTicket] = []
+        self.__closed = False
+
+        self.__thread = threading.Thread(target=self.__run, name="group-commit-writer", daemon=True)
+        self.__thread.start()
+
+    def replace(self, path: str, content: str) -> None:
+        """Queue a full rewrite of the file, superseding anything queued before it."""
+
+        def merge(pending: _PendingFile) -> None:
+            pending.replacement = content
+            pending.appends.clear()
+
+        self.__enqueue(path, merge)
+
+    def append(self, path: str, content: str) -> None:
+        """Queue content to be appended to the file."""
+        self.__enqueue(path, lambda pending: pending.appends.append(content))
+
+    def flush(self) -> None:
+        """Commit everything queued so far and wait for it, regardless of durability level."""
+        with self.__lock:
+            tickets = self.__in_flight + [ticket for pending in self.__pending.values() for ticket in pending.tickets]
+
+        self.__skip_interval.set()
+        for ticket in tickets:
+            ticket.done.wait()
+
+    def close(self) -> None:
+        """Commit everything still queued and stop the background thread."""
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__has_pending.notify()
+
+        self.__skip_interval.set()
+        self.__thread.join()
+
+    def __enqueue(self, path: str, merge) -> None:
+        ticket = _WriteTicket()
+
+        with self.__lock:
+            if self.__closed:
+                raise Exception("Cannot write to a closed GroupCommitWriter")
+
+            pending = self.__pending.setdefault(path, _PendingFile())
+            merge(pending)
+            pending.tickets.append(ticket)
+            self.__has_pending.notify()
+
+        if self.__durability is not DurabilityLevel.NONE:
+            # The caller blocks: commit right away instead of waiting for more writes to pile up
+            self.__skip_interval.set()
+            ticket.wait()
+
+    def __run(self) -> None:
+        while True:
+            with self.__lock:
+                while not self.__pending and not self.__closed:
+                    self.__has_pending.wait()
+
+                if not self.__pending and self.__closed:
+                    return
+
+            # Leave a short window for more writes to pile up before committing the batch
+            if self.__skip_interval.wait(self.__commit_interval):
+                self.__skip_interval.clear()
+
+            with self.__lock:
+                batch, self.__pending = self.__pending, {}
+                self.__in_flight = [ticket for pending in batch.values() for ticket in pending.tickets]
+
+            for path, pending in batch.items():
+                self.__commit(path, pending)
+
+            with self.__lock:
+                self.__in_flight = []
+
+    def __commit(self, path: str, pending: _PendingFile) -> None:
+        error: Exception | None = None
+
+        try:
+            if pending.replacement is not None:
+                self.__file_service.write_file(
+                    path, pending.replacement + "".join(pending.appends), atomic=True, durability=self.__durability
+                )
+            else:
+                self.__file_service.append_to_file(path, "".join(pending.appends), durability=self.__durability)
+        except Exception as e:
+            error = e
+            self.__logger.log_error(f"Failed to commit writes to '{path}': {e}")
+
+        for ticket in pending.tickets:
+            ticket.error = error
+            ticket.done.set()
@@ -1,14 +1,16 @@
 import json
 
 from dotenv import load_dotenv
-from openai import OpenAI
 from openai.types.chat import ChatCompletion, ChatCompletionMessageToolCall
 from typing import Any
+from src.models.iteration_type import IterationType
+from src.models.model_route import ModelRoute
 from src.models.tool_call_request import ToolCallRequest
 
 from openai.types.chat.chat_completion import Choice
 
 from src.services.memory_service import MemoryService
+from src.services.model_router import ModelRouter
 from src.contracts.logger_interface import LoggerInterface
 from src.services.console_logger_service import ConsoleLoggerService
 from src.utils.file_utils import read_file
@@ -17,13 +19,18 @@ load_dotenv()
 
 
 class LlmService:
-    def __init__(self, model: str, tools_definition: list, logger: LoggerInterface | None = None):
-        self.__client: OpenAI = OpenAI()
-        self.model = model
+    # Tools whose results usually only lead to choosing the next path to look at: cheap steps
+    __NAVIGATION_TOOLS: frozenset = frozenset({"list_files"})
+
+    def __init__(self, model: str, tools_definition: list, logger: LoggerInterface | None = None,
+                 system_prompt: str | None = None, persist_history: bool = True,
+                 model_router: ModelRouter | None = None):
         self.tools_definition = tools_definition
         self.__logger = logger or ConsoleLoggerService()
+        # Without a shared router, the model is the only route
+        self.__router: ModelRouter = model_router or ModelRouter([ModelRoute(model)], logger=self.__logger)
 
-        self.__SYSTEM_PROMPT: str = read_file("system-prompt.md")
+        self.__SYSTEM_PROMPT: str = system_prompt or read_file("system-prompt.md")
         self.messages: list = [
             {
                 "role": "system",
@@ -31,15 +38,18 @@ class LlmService:
             }
         ]
 
-        self.__memory: MemoryService = MemoryService(self.__logger)
+        # Sub-agents keep their history in memory only, so they don't overwrite the main chat history
+        self.__memory: MemoryService | None = MemoryService(self.__logger) if persist_history else None
 
     def get_next_tool_call(self) -> ToolCallRequest:
         # TODO : Handle edge cases : http errors, llm refusal and miscellaneous errors
         # TODO : Monitor tokens count
-        completion: ChatCompletion = self.__client.chat.completions.create(
-            model=self.model,
+        completion: ChatCompletion
+        completion, _ = self.__router.complete(
             messages=self.messages,
             tools=self.tools_definition,
+            iteration_type=self.__get_iteration_type(),
+            context_tokens=self.__estimate_context_tokens(),
         )
 
         first_completion_choice: Choice = completion.choices[0]
@@ -97,6 +107,41 @@ class LlmService:
             "content": str(tool_call_result)
         })
 
+    def log_model_stats(self) -> None:
+        self.__router.log_stats()
+
+    def __get_iteration_type(self) -> IterationType:
+        last_message: dict = self.messages[-1]
+        if last_message["role"] != "tool":
+            return IterationType.REASONING
+
+        # Recovering from a failed tool call needs the strong model: tool errors are reported
+        # as "Error: ..." or "Tool execution failed: ..." (see Agent.run)
+        if last_message["content"].startswith(("Error", "Tool execution failed")):
+            return IterationType.REASONING
+
+        # After reading files, delegating or asking the user, the next step usually writes content
+        # or composes the final response, so only navigation results count as cheap follow-ups
+        if self.__get_last_tool_name() in self.__NAVIGATION_TOOLS:
+            return IterationType.NAVIGATION
+
+        return IterationType.REASONING
+
+    def __get_last_tool_name(self) -> str | None:
+        # The tool response is always preceded by the assistant message holding its single tool call
+        if len(self.messages) < 2 or not self.messages[-2].get("tool_calls"):
+            return None
+        return self.messages[-2]["tool_calls"][0]["function"]["name"]
+
+    def __estimate_context_tokens(self) -> int:
+        # Rough estimate (~4 characters per token), good enough for routing decisions
+        characters: int = sum(
+            len(message.get("content") or "") + len(str(message.get("tool_calls") or ""))
+            for message in self.messages
+        )
+        return characters // 4
+
     def __push_message(self, message: dict) -> None:
         self.messages.append(message)
-        self.__memory.save_chat_history(self.messages)
+        if self.__memory is not None:
+            self.__memory.save_chat_history(self.messages)
@@ -1,7 +1,10 @@
+import atexit
 import json
 import os
 from typing import Dict, List
+from src.models.durability_level import DurabilityLevel
 from src.services.file_operations_service import FileOperationsService
+from src.services.group_commit_writer import GroupCommitWriter
 from src.contracts.logger_interface import LoggerInterface
 from src.services.console_logger_service import ConsoleLoggerService
 
@@ -10,11 +13,14 @@ class MemoryService:
     """
     Comprehensive memory service handling both user preferences and chat history.
     Uses FileOperationsService for all file system operations.
+    Chat history is rewritten every turn, so it goes through a GroupCommitWriter
+    that coalesces those saves and replaces the file atomically.
     """
 
     __DEFAULT_MEMORY_FOLDER: str = ".memory"
     __DEFAULT_CHAT_HISTORY_FILE_NAME: str = "chat-history.json"
     __DEFAULT_PREFERENCES_FILE_NAME: str = "preferences.json"
+    __DEFAULT_WRITE_DURABILITY: DurabilityLevel = DurabilityLevel.NONE
 
     def __init__(self, logger: LoggerInterface | None = None) -> None:
         self.__file_service = FileOperationsService()
@@ -27,17 +33,26 @@ class MemoryService:
         self.__chat_history_file_path = os.path.join(self.__memory_folder_path, history_file_name)
         self.__preferences_file_path = os.path.join(self.__memory_folder_path, preferences_file_name)
 
+        # Created on first save, so services that never touch the chat history don't start a writer thread
+        self.__history_writer: GroupCommitWriter | None = None
+
     def save_chat_history(self, chat_messages: List[Dict]) -> None:
         """Save conversation history to file."""
         try:
             history_content = json.dumps(chat_messages, indent=2)
-            self.__file_service.write_file(self.__chat_history_file_path, history_content)
+            if self.__history_writer is None:
+                self.__history_writer = GroupCommitWriter(durability=self.__read_write_durability(),
+                                                          logger=self.__logger)
+                atexit.register(self.__history_writer.close)
+            self.__history_writer.replace(self.__chat_history_file_path, history_content)
         except Exception as e:
             self.__logger.log_error(f"Failed to save chat history: {e}")
 
     def load_chat_history(self) -> List[Dict]:
         """Load conversation history from file."""
         try:
+            if self.__history_writer is not None:
+                self.__history_writer.flush()
             if self.__file_service.file_exists(self.__chat_history_file_path):
                 content = self.__file_service.read_file(self.__chat_history_file_path)
                 return json.loads(content)
@@ -51,7 +66,9 @@ class MemoryService:
         """Save user preferences/memories to file. Completely replaces existing preferences."""
         try:
             preferences_content = json.dumps(preferences, indent=2)
-            self.__file_service.write_file(self.__preferences_file_path, preferences_content)
+            self.__file_service.write_file(
+                self.__preferences_file_path, preferences_content, atomic=True, durability=DurabilityLevel.FSYNC
+            )
         except Exception as e:
             raise Exception(f"Failed to save user preferences: {e}")
 
@@ -67,3 +84,17 @@ class MemoryService:
             raise Exception(f"User preferences file contains invalid JSON: {e}")
         except Exception as e:
             raise Exception(f"Failed to load user preferences: {e}")
+
+    def __read_write_durability(self) -> DurabilityLevel:
+        """Read the chat history durability level (none, flush or fsync) from the environment."""
+        value: str | None = os.getenv('WRITE_DURABILITY')
+        if not value:
+            return self.__DEFAULT_WRITE_DURABILITY
+
+        try:
+            return DurabilityLevel(value.strip().lower())
+        except ValueError:
+            self.__logger.log_error(
+                f"Unknown WRITE_DURABILITY '{value}', falling back to '{self.__DEFAULT_WRITE_DURABILITY.value}'"
+            )
+            return self.__DEFAULT_WRITE_DURABILITY
@@ -0,0 +1,145 @@
+import json
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from openai.types.chat import ChatCompletion, ChatCompletionMessageFunctionToolCall
+
+from src.contracts.llm_backend_interface import LlmBackendInterface
+from src.contracts.logger_interface import LoggerInterface
+from src.models.iteration_type import IterationType
+from src.models.model_route import ModelRoute
+from src.models.model_tier import ModelTier
+from src.services.console_logger_service import ConsoleLoggerService
+
+
+class ModelRouter:
+    """
+    Picks the model used for each iteration of the agent loop.
+
+    Navigation steps with a small context go to FAST models, everything else to STRONG ones.
+    Every model keeps a rolling window of its recent latencies and errors: a model that fails too often,
+    or whose median latency exceeds its route's max_latency, is only tried after the healthy ones.
+    When a request fails (max_latency is also the request timeout) or the model answers with
+    something other than a tool call, it counts as an error and the next candidate is tried.
+    Thread-safe, so one router can be shared between an agent and its sub-agents.
+    """
+
+    def __init__(self, routes: List[ModelRoute], backend: LlmBackendInterface | None = None,
+                 logger: LoggerInterface | None = None, fast_context_limit: int = 8000,
+                 window_size: int = 20, window_seconds: float = 300, min_samples: int = 3,
+                 max_error_rate: float = 0.5) -> None:
+        if not routes:
+            raise ValueError("At least one model route is required")
+
+        if backend is None:
+            # Imported lazily so stub backends don't need the OpenAI client
+            from src.services.openai_backend import OpenAiBackend
+            backend = OpenAiBackend()
+
+        self.__routes = routes
+        self.__backend = backend
+        self.__logger = logger or ConsoleLoggerService()
+        self.__fast_context_limit = fast_context_limit
+        self.__window_seconds = window_seconds
+        self.__min_samples = min_samples
+        self.__max_error_rate = max_error_rate
+
+        self.__lock = threading.Lock()
+        # (timestamp, latency in seconds, succeeded) for the last calls of each model
+        self.__windows: Dict[str, Deque[Tuple[float, float, bool]]] = {
+            route.model: deque(maxlen=window_size) for route in routes
+        }
+
+    def complete(self, messages: List[Dict], tools: List[Dict], iteration_type: IterationType,
+                 context_tokens: int) -> Tuple[ChatCompletion, str]:
+        """Get a completion from the best available model. Returns the completion and the model used."""
+        last_error: Exception | None = None
+
+        for route in self.select_routes(iteration_type, context_tokens):
+            started_at = time.monotonic()
+            try:
+                completion = self.__backend.complete(route.model, messages, tools, timeout=route.max_latency)
+                self.__check_tool_call(completion)
+            except Exception as e:
+                self.__record(route.model, time.monotonic() - started_at, succeeded=False)
+                self.__logger.log_error(f"Model {route.model} failed, falling back: {e}")
+                last_error = e
+                continue
+
+            self.__record(route.model, time.monotonic() - started_at, succeeded=True)
+            return completion, route.model
+
+        raise Exception(f"All models failed, last error: {last_error}")
+
+    def select_routes(self, iteration_type: IterationType, context_tokens: int) -> List[ModelRoute]:
+        """Return the routes to try for this iteration, best candidate first."""
+        preferred_tier = ModelTier.STRONG
+        if iteration_type is IterationType.NAVIGATION and context_tokens <= self.__fast_context_limit:
+            preferred_tier = ModelTier.FAST
+
+        # Models whose context window is too small are only kept if nothing else fits
+        candidates = [
+            route for route in self.__routes
+            if route.max_context_tokens is None or route.max_context_tokens >= context_tokens
+        ] or list(self.__routes)
+
+        # sorted() is stable: within each group the configured order is kept
+        return sorted(candidates, key=lambda route: (not self.__is_healthy(route), route.tier is not preferred_tier))
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Rolling window statistics for every model."""
+        return {route.model: self.__compute_stats(route.model) for route in self.__routes}
+
+    def log_stats(self) -> None:
+        """Send the statistics of every model that has been used to the logger."""
+        for model, stats in self.get_stats().items():
+            if stats["calls"]:
+                self.__logger.log_model_stats(model, stats)
+
+    @staticmethod
+    def __check_tool_call(completion: ChatCompletion) -> None:
+        """The agent only works through tool calls: plain text or malformed arguments are failures."""
+        choice = completion.choices[0]
+        if choice.finish_reason != "tool_calls" or not choice.message.tool_calls:
+            raise Exception(f"Expected a tool call, got finish reason '{choice.finish_reason}'")
+
+        tool_call = choice.message.tool_calls[0]
+        if not isinstance(tool_call, ChatCompletionMessageFunctionToolCall):
+            raise Exception(f"Expected a function tool call, got '{tool_call.type}'")
+
+        json.loads(tool_call.function.arguments)
+
+    def __record(self, model: str, latency: float, succeeded: bool) -> None:
+        with self.__lock:
+            self.__windows[model].append((time.monotonic(), latency, succeeded))
+
+    def __recent_samples(self, model: str) -> List[Tuple[float, float, bool]]:
+        threshold = time.monotonic() - self.__window_seconds
+        with self.__lock:
+            return [sample for sample in self.__windows[model] if sample[0] >= threshold]
+
+    def __is_healthy(self, route: ModelRoute) -> bool:
+        stats = self.__compute_stats(route.model)
+        if stats["calls"] < self.__min_samples:
+            return True
+
+        if stats["error_rate"] > self.__max_error_rate:
+            return False
+
+        return route.max_latency is None or stats["p50_latency"] is None or stats["p50_latency"] <= route.max_latency
+
+    def __compute_stats(self, model: str) -> Dict[str, Any]:
+        samples = self.__recent_samples(model)
+        latencies = sorted(latency for _, latency, succeeded in samples if succeeded)
+        errors = sum(1 for _, _, succeeded in samples if not succeeded)
+
+        return {
+            "calls": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples) if samples else 0.0,
+            "p50_latency": statistics.median(latencies) if latencies else None,
+            "p95_latency": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+        }
@@ -0,0 +1,24 @@
+from dotenv import load_dotenv
+from openai import NOT_GIVEN, OpenAI
+from openai.types.chat import ChatCompletion
+
+from src.contracts.llm_backend_interface import LlmBackendInterface
+
+load_dotenv()
+
+
+class OpenAiBackend(LlmBackendInterface):
+    """OpenAI chat completions API backend."""
+
+    def __init__(self) -> None:
+        self.__client: OpenAI = OpenAI()
+
+    # Messages and tools are built as plain dicts: the SDK's TypedDict params are not checked here
+    def complete(self, model: str, messages: list, tools: list,
+                 timeout: float | None = None) -> ChatCompletion:
+        return self.__client.chat.completions.create(
+            model=model,
+            messages=messages,
+            tools=tools,
+            timeout=timeout if timeout is not None else NOT_GIVEN,
+        )
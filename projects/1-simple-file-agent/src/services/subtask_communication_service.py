@@ -0,0 +1,28 @@
+from src.contracts.communication_interface import CommunicationInterface
+from src.contracts.logger_interface import LoggerInterface
+from src.services.console_logger_service import ConsoleLoggerService
+
+
+class SubtaskCommunicationService(CommunicationInterface):
+    """
+    Non-interactive communication used by sub-agents.
+    There is no user to talk to: questions get a standard answer and
+    final responses are handed back to the parent agent instead of being displayed.
+    """
+
+    __NO_USER_ANSWER: str = (
+        "No user is available while working on a subtask. "
+        "Proceed with your best judgement, or explain what is missing in your final response."
+    )
+
+    def __init__(self, logger: LoggerInterface | None = None):
+        self.__logger = logger or ConsoleLoggerService()
+
+    def ask_user(self, message: str) -> str:
+        """Answer on behalf of the absent user."""
+        self.__logger.log_progress(f'Sub-agent asked for clarification: {message}')
+        return self.__NO_USER_ANSWER
+
+    def respond_to_user(self, message: str) -> None:
+        """The response is returned to the parent agent, only note that the subtask is done."""
+        self.__logger.log_progress('Sub-agent finished its subtask')
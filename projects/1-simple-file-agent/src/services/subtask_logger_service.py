@@ -0,0 +1,53 @@
+import threading
+from typing import Any, Dict
+
+from src.contracts.logger_interface import LoggerInterface
+from src.models.run_metrics import RunMetrics
+
+
+class SubtaskLoggerService(LoggerInterface):
+    """
+    Logger wrapper for sub-agents running concurrently.
+    Every entry is tagged with the sub-agent's label, and entries are written one at a time
+    so the multi-line output of different sub-agents doesn't interleave.
+    """
+
+    # Shared by all sub-agents writing to the same output
+    __output_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, logger: LoggerInterface, label: str):
+        self.__logger = logger
+        self.__prefix = f"[{label}]"
+
+    def log_tool_call(self, tool_name: str, tool_args: Dict[str, Any] | None = None) -> None:
+        with self.__output_lock:
+            self.__logger.log_tool_call(f"{self.__prefix} {tool_name}", tool_args)
+
+    def log_tool_result(self, content: Any) -> None:
+        with self.__output_lock:
+            self.__logger.log_tool_result(f"{self.__prefix} {content}")
+
+    def log_agent_response(self, message: str) -> None:
+        with self.__output_lock:
+            self.__logger.log_agent_response(f"{self.__prefix} {message}")
+
+    def log_progress(self, message: str) -> None:
+        with self.__output_lock:
+            self.__logger.log_progress(f"{self.__prefix} {message}")
+
+    def log_error(self, message: str) -> None:
+        with self.__output_lock:
+            self.__logger.log_error(f"{self.__prefix} {message}")
+
+    def log_user_prompt(self, message: str) -> None:
+        with self.__output_lock:
+            self.__logger.log_user_prompt(f"{self.__prefix} {message}")
+
+    def log_model_stats(self, model: str, stats: Dict[str, Any]) -> None:
+        with self.__output_lock:
+            self.__logger.log_model_stats(f"{self.__prefix} {model}", stats)
+
+    def log_run_metrics(self, metrics: RunMetrics) -> None:
+        with self.__output_lock:
+            self.__logger.log_progress(f"{self.__prefix} Sub-agent run finished")
+            self.__logger.log_run_metrics(metrics)
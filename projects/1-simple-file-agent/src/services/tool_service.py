@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set
 
 from src.contracts.tool_service_interface import ToolServiceInterface
 from src.contracts.communication_interface import CommunicationInterface
@@ -9,13 +9,17 @@ from src.services.file_operations_service import FileOperationsService
 from src.services.console_communication_service import ConsoleCommunicationService
 from src.services.console_logger_service import ConsoleLoggerService
 from src.services.memory_service import MemoryService
+from src.services.workspace_watcher import WorkspaceWatcher
 
 
 class AgentToolService(ToolServiceInterface):
 
+    __READ_ONLY_TOOLS: frozenset = frozenset({"list_files", "read_file", "load_memories"})
+
     def __init__(self, communication_service: CommunicationInterface | None = None,
-                 logger: LoggerInterface | None = None) -> None:
-        self.__file_service = FileOperationsService()
+                 logger: LoggerInterface | None = None, workspace_watcher: WorkspaceWatcher | None = None,
+                 excluded_tools: Set[str] | None = None) -> None:
+        self.__file_service = FileOperationsService(workspace_watcher)
         self.__logger = logger or ConsoleLoggerService()
         self.__communication_service = communication_service or ConsoleCommunicationService(self.__logger)
         self.__memory_service = MemoryService(self.__logger)
@@ -30,6 +34,11 @@ class AgentToolService(ToolServiceInterface):
             "load_memories": self.__load_user_preferences
         }
 
+        # Excluded tools are neither advertised to the model nor invocable
+        self.__excluded_tools: Set[str] = excluded_tools or set()
+        for tool_name in self.__excluded_tools:
+            self.__tools_mapping.pop(tool_name, None)
+
     def invoke(self, tool_call: ToolCallRequest) -> ToolCallResult:
         tool_name: str = tool_call.tool_name
         tool_args: dict = tool_call.tool_arguments
@@ -43,6 +52,9 @@ class AgentToolService(ToolServiceInterface):
             self.__logger.log_error(f"Tool call failed {tool_name}: {error}")
             raise Exception("Invalid tool arguments")
 
+    def is_read_only(self, tool_name: str) -> bool:
+        return tool_name in self.__READ_ONLY_TOOLS
+
     def __list_files(self, path: str) -> ToolCallResult:
         try:
             result = self.__file_service.list_files(path)
@@ -70,7 +82,7 @@ class AgentToolService(ToolServiceInterface):
 
     def __write_file(self, path: str, content: str) -> ToolCallResult:
         try:
-            self.__file_service.write_file(path, content)
+            self.__file_service.write_file(path, content, atomic=True)
             return ToolCallResult(content=f"Successfully wrote to '{path}'")
         except PermissionError:
             return ToolCallResult(content=f"Error: Permission denied to write to '{path}'")
@@ -96,7 +108,7 @@ class AgentToolService(ToolServiceInterface):
     def __submit_final_response(self, message: str) -> ToolCallResult:
         try:
             self.__communication_service.respond_to_user(message)
-            return ToolCallResult(exit_loop=True)
+            return ToolCallResult(content=message, exit_loop=True)
         except Exception as e:
             return ToolCallResult(content=f"Error displaying response: {str(e)}")
 
@@ -277,4 +289,4 @@ class AgentToolService(ToolServiceInterface):
             }
         ]
 
-        return tools_definition
+        return [tool for tool in tools_definition if tool["function"]["name"] not in self.__excluded_tools]
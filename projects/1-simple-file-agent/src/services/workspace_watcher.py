@@ -0,0 +1,424 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from src.contracts.logger_interface import LoggerInterface
+from src.models.file_metadata import FileMetadata
+from src.services.console_logger_service import ConsoleLoggerService
+
+
+class WorkspaceWatcher:
+    """
+    Keeps an in-memory snapshot of the metadata (size, mtime, type) of every file under a root directory,
+    so metadata queries become memory lookups instead of syscalls.
+
+    Changes are picked up through inotify on Linux, or by rescanning the tree every poll_interval
+    seconds elsewhere (the snapshot can then lag behind by that much). Subscribers are called with
+    the path of every entry that changed. Ignored, unreadable or symlinked directories are not
+    tracked: covers() returns False for them so callers fall back to the file system.
+    """
+
+    __DEFAULT_IGNORED_DIRECTORIES: frozenset = frozenset({".git", "venv", ".venv", "__pycache__", "node_modules"})
+
+    # inotify(7) constants
+    __IN_MODIFY: int = 0x00000002
+    __IN_ATTRIB: int = 0x00000004
+    __IN_CLOSE_WRITE: int = 0x00000008
+    __IN_MOVED_FROM: int = 0x00000040
+    __IN_MOVED_TO: int = 0x00000080
+    __IN_CREATE: int = 0x00000100
+    __IN_DELETE: int = 0x00000200
+    __IN_Q_OVERFLOW: int = 0x00004000
+    __IN_IGNORED: int = 0x00008000
+    __IN_ONLYDIR: int = 0x01000000
+    __WATCH_MASK: int = (__IN_MODIFY | __IN_ATTRIB | __IN_CLOSE_WRITE | __IN_MOVED_FROM | __IN_MOVED_TO
+                         | __IN_CREATE | __IN_DELETE | __IN_ONLYDIR)
+    __EVENT_HEADER: struct.Struct = struct.Struct("iIII")
+
+    def __init__(self, root: str = ".", poll_interval: float = 2.0,
+                 ignored_directories: Iterable[str] | None = None, use_inotify: bool = True,
+                 logger: LoggerInterface | None = None) -> None:
+        self.__root = os.path.abspath(root)
+        self.__poll_interval = poll_interval
+        self.__ignored_directories = frozenset(
+            self.__DEFAULT_IGNORED_DIRECTORIES if ignored_directories is None else ignored_directories
+        )
+        self.__use_inotify = use_inotify
+        self.__logger = logger or ConsoleLoggerService()
+
+        self.__lock = threading.RLock()
+        self.__metadata: Dict[str, FileMetadata] = {}
+        # Entry names of every tracked directory
+        self.__children: Dict[str, Set[str]] = {}
+        self.__subscribers: List[Callable[[str], None]] = []
+        # Paths updated while a full rescan runs, the rescan's result is stale for them
+        self.__updated_during_rescan: Set[str] | None = None
+
+        self.__libc: ctypes.CDLL | None = None
+        self.__inotify_fd: int | None = None
+        self.__watched_paths: Dict[int, str] = {}
+        self.__watch_descriptors: Dict[str, int] = {}
+        self.__watch_limit_reached = False
+
+        self.__stop_requested = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.__inotify_fd is not None
+
+    def start(self) -> None:
+        """Take the initial snapshot and start following changes in the background."""
+        if self.is_running:
+            return
+
+        self.__stop_requested.clear()
+        if self.__use_inotify:
+            self.__init_inotify()
+
+        metadata: Dict[str, FileMetadata] = {}
+        children: Dict[str, Set[str]] = {}
+        self.__record_root(metadata)
+        self.__scan(self.__root, metadata, children)
+        with self.__lock:
+            self.__metadata, self.__children = metadata, children
+
+        self.__thread = threading.Thread(target=self.__watch, name="workspace-watcher", daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop watching and drop the snapshot, queries go back to the file system."""
+        self.__stop_requested.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+        with self.__lock:
+            self.__metadata, self.__children = {}, {}
+            self.__watched_paths, self.__watch_descriptors = {}, {}
+
+        if self.__inotify_fd is not None:
+            os.close(self.__inotify_fd)
+            self.__inotify_fd = None
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Call back with the absolute path of every entry that changes."""
+        with self.__lock:
+            self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str], None]) -> None:
+        with self.__lock:
+            if callback in self.__subscribers:
+                self.__subscribers.remove(callback)
+
+    def covers(self, path: str) -> bool:
+        """Whether the snapshot can tell if this path exists and what it is."""
+        if not self.is_running:
+            return False
+
+        path = os.path.abspath(path)
+        with self.__lock:
+            return path == self.__root and bool(self.__children) or os.path.dirname(path) in self.__children
+
+    def get_metadata(self, path: str) -> FileMetadata | None:
+        """Metadata of the path, None if it doesn't exist (or isn't covered)."""
+        with self.__lock:
+            return self.__metadata.get(os.path.abspath(path))
+
+    def list_directory(self, path: str) -> List[Tuple[str, bool]] | None:
+        """(name, is_dir) of every entry of a tracked directory, None if the directory isn't tracked."""
+        if not self.is_running:
+            return None
+
+        path = os.path.abspath(path)
+        with self.__lock:
+            names = self.__children.get(path)
+            if names is None:
+                return None
+
+            entries: List[Tuple[str, bool]] = []
+            for name in sorted(names):
+                metadata = self.__metadata.get(os.path.join(path, name))
+                entries.append((name, metadata is not None and metadata.is_dir))
+            return entries
+
+    def refresh(self, path: str) -> None:
+        """Update the snapshot right away, e.g. after writing the file ourselves."""
+        path = os.path.abspath(path)
+        if not self.is_running or not self.__is_within_root(path):
+            return
+
+        # Directories may have been created along the way: start from the first untracked one
+        target = path
+        with self.__lock:
+            while target != self.__root and os.path.dirname(target) not in self.__children:
+                target = os.path.dirname(target)
+
+        self.__update(target)
+
+    def __is_within_root(self, path: str) -> bool:
+        return path == self.__root or path.startswith(self.__root.rstrip(os.sep) + os.sep)
+
+    def __record_root(self, metadata: Dict[str, FileMetadata]) -> None:
+        try:
+            root_stat = os.stat(self.__root)
+        except OSError:
+            return
+        metadata[self.__root] = FileMetadata(root_stat.st_size, root_stat.st_mtime, stat.S_ISDIR(root_stat.st_mode))
+
+    def __scan(self, directory: str, metadata: Dict[str, FileMetadata], children: Dict[str, Set[str]]) -> None:
+        """Record the metadata of everything under the directory."""
+        pending: List[str] = [directory]
+
+        while pending:
+            current = pending.pop()
+
+            # Watch before listing so nothing created in between is missed
+            if self.uses_inotify and not self.__add_watch(current):
+                continue
+
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+
+            names: Set[str] = set()
+            for entry in entries:
+                names.add(entry.name)
+                try:
+                    entry_stat = entry.stat()
+                except OSError:
+                    continue  # Broken symlink: listed, but neither a file nor a directory
+
+                is_dir = stat.S_ISDIR(entry_stat.st_mode)
+                metadata[entry.path] = FileMetadata(entry_stat.st_size, entry_stat.st_mtime, is_dir)
+                if is_dir and not entry.is_symlink() and entry.name not in self.__ignored_directories:
+                    pending.append(entry.path)
+
+            children[current] = names
+
+    def __update(self, path: str) -> None:
+        """Re-stat a single path and update the snapshot accordingly."""
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            path_stat = None
+
+        name = os.path.basename(path)
+        parent = os.path.dirname(path)
+        parent_changed = False
+
+        with self.__lock:
+            if self.__updated_during_rescan is not None:
+                self.__updated_during_rescan.add(path)
+
+            if path == self.__root:
+                if path_stat is not None:
+                    self.__metadata[path] = FileMetadata(path_stat.st_size, path_stat.st_mtime, True)
+                was_listed = True
+            elif parent not in self.__children:
+                return
+            else:
+                was_listed = name in self.__children[parent]
+
+                if path_stat is None:
+                    self.__remove_subtree(path)
+                    if os.path.lexists(path):
+                        self.__children[parent].add(name)
+                    else:
+                        self.__children[parent].discard(name)
+                else:
+                    is_dir = stat.S_ISDIR(path_stat.st_mode)
+                    self.__metadata[path] = FileMetadata(path_stat.st_size, path_stat.st_mtime, is_dir)
+                    self.__children[parent].add(name)
+
+                    if not is_dir and path in self.__children:
+                        self.__remove_subtree(path, keep_self=True)
+                    elif (is_dir and path not in self.__children and not os.path.islink(path)
+                          and name not in self.__ignored_directories):
+                        self.__scan(path, self.__metadata, self.__children)
+
+            # Adding or removing an entry changes the directory's own size and mtime
+            if path != self.__root and was_listed != (name in self.__children[parent]):
+                parent_changed = self.__restat_directory(parent)
+
+        self.__publish(path)
+        if parent_changed:
+            self.__publish(parent)
+
+    def __restat_directory(self, directory: str) -> bool:
+        try:
+            directory_stat = os.stat(directory)
+        except OSError:
+            return False
+
+        self.__metadata[directory] = FileMetadata(directory_stat.st_size, directory_stat.st_mtime, True)
+        return True
+
+    def __remove_subtree(self, path: str, keep_self: bool = False) -> None:
+        prefix = path.rstrip(os.sep) + os.sep
+
+        for tracked_path in [p for p in self.__metadata if p.startswith(prefix)]:
+            del self.__metadata[tracked_path]
+        if not keep_self:
+            self.__metadata.pop(path, None)
+
+        for directory in [d for d in self.__children if d == path or d.startswith(prefix)]:
+            del self.__children[directory]
+            watch_descriptor = self.__watch_descriptors.pop(directory, None)
+            # The descriptor may already belong to the same directory moved elsewhere in the tree
+            if watch_descriptor is not None and self.__watched_paths.get(watch_descriptor) == directory:
+                del self.__watched_paths[watch_descriptor]
+                # Release the watch, otherwise directories moved out of the root keep counting
+                # against the per-user watch limit
+                if self.__libc is not None and self.__inotify_fd is not None:
+                    self.__libc.inotify_rm_watch(self.__inotify_fd, watch_descriptor)
+
+    def __publish(self, path: str) -> None:
+        with self.__lock:
+            subscribers = list(self.__subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(path)
+            except Exception as e:
+                self.__logger.log_error(f"Workspace change subscriber failed: {e}")
+
+    def __watch(self) -> None:
+        try:
+            if self.uses_inotify:
+                self.__follow_inotify_events()
+            else:
+                self.__poll()
+        except Exception as e:
+            # A stale snapshot must not be served: queries go back to the file system
+            self.__logger.log_error(f"Workspace watcher stopped, file metadata is no longer cached: {e}")
+            with self.__lock:
+                self.__metadata, self.__children = {}, {}
+
+    def __poll(self) -> None:
+        while not self.__stop_requested.wait(self.__poll_interval):
+            self.__rescan()
+
+    def __rescan(self) -> None:
+        """Rebuild the whole snapshot and publish the differences."""
+        metadata: Dict[str, FileMetadata] = {}
+        children: Dict[str, Set[str]] = {}
+
+        with self.__lock:
+            self.__updated_during_rescan = set()
+
+        self.__record_root(metadata)
+        self.__scan(self.__root, metadata, children)
+
+        with self.__lock:
+            previous = self.__metadata
+            self.__metadata, self.__children = metadata, children
+            updated_paths, self.__updated_during_rescan = self.__updated_during_rescan, None
+
+        # The scan may have listed a directory before a concurrent refresh() wrote into it:
+        # update those paths again so they are neither lost nor reported as deleted
+        for path in sorted(updated_paths):
+            self.__update(path)
+
+        with self.__lock:
+            current = dict(self.__metadata)
+
+        for path in previous.keys() | current.keys():
+            if previous.get(path) != current.get(path):
+                self.__publish(path)
+
+    def __init_inotify(self) -> None:
+        if not sys.platform.startswith("linux"):
+            return
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            inotify_fd = libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+
+        if inotify_fd < 0:
+            self.__logger.log_error(f"inotify unavailable, polling instead: {os.strerror(ctypes.get_errno())}")
+            return
+
+        self.__libc = libc
+        self.__inotify_fd = inotify_fd
+
+    def __add_watch(self, directory: str) -> bool:
+        if self.__libc is None or self.__inotify_fd is None:
+            return False
+
+        watch_descriptor = self.__libc.inotify_add_watch(
+            self.__inotify_fd, os.fsencode(directory), ctypes.c_uint32(self.__WATCH_MASK)
+        )
+
+        if watch_descriptor < 0:
+            # Usually the inotify watch limit: leave this directory untracked so it's read from disk
+            if not self.__watch_limit_reached:
+                self.__watch_limit_reached = True
+                self.__logger.log_error(
+                    f"Cannot watch '{directory}', it won't be cached: {os.strerror(ctypes.get_errno())}"
+                )
+            return False
+
+        with self.__lock:
+            self.__watched_paths[watch_descriptor] = directory
+            self.__watch_descriptors[directory] = watch_descriptor
+        return True
+
+    def __follow_inotify_events(self) -> None:
+        # stop() only closes the descriptor once this loop has returned
+        inotify_fd = self.__inotify_fd
+        if inotify_fd is None:
+            return
+
+        while not self.__stop_requested.is_set():
+            ready, _, _ = select.select([inotify_fd], [], [], 0.5)
+            if not ready:
+                continue
+
+            data = os.read(inotify_fd, 64 * 1024)
+            changed_paths: Dict[str, None] = {}  # Ordered set: each path is re-stat'ed once per batch
+            overflow = False
+            offset = 0
+
+            while offset < len(data):
+                watch_descriptor, mask, _, name_length = self.__EVENT_HEADER.unpack_from(data, offset)
+                offset += self.__EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+                offset += name_length
+
+                if mask & self.__IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+
+                with self.__lock:
+                    directory = self.__watched_paths.get(watch_descriptor)
+                    if mask & self.__IN_IGNORED:
+                        # The kernel already dropped the watch (directory deleted), forget it without removing it
+                        if directory is not None:
+                            del self.__watched_paths[watch_descriptor]
+                            if self.__watch_descriptors.get(directory) == watch_descriptor:
+                                del self.__watch_descriptors[directory]
+                        continue
+
+                if directory is not None:
+                    changed_paths[os.path.join(directory, name) if name else directory] = None
+
+            if overflow:
+                self.__rescan()
+                continue
+
+            for path in changed_paths:
+                self.__update(path)